@@ -27,9 +27,21 @@ See AG_UI_AND_FOUNDRY_EXPLAINED.md for detailed explanations.
 """
 
 import asyncio
-import os
+import atexit
+import importlib.util
+import logging
+import queue
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import AsyncIterator
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import uvicorn
 from agent_framework import Agent
 
 # AG-UI Support: This import from agent-framework-ag-ui package provides the
@@ -41,104 +53,323 @@ from agent_framework.ag_ui.tools import HostedMCPTool
 # Azure Foundry Deployment: This provider connects your agent to Azure AI Project
 # (Foundry) infrastructure, enabling enterprise-grade managed deployment
 from agent_framework.azure import AzureAIProjectAgentProvider
+from azure.identity.aio import DefaultAzureCredential
+
+from config import (
+    Config,
+    get_config,
+    get_mcp_batch_tool_config,
+    get_mcp_tool_config,
+)
+
+# uvloop is an optional, faster event loop for the AG-UI streaming workload.
+# It is not available on Windows, so fall back to the default asyncio loop.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # type: ignore[assignment]
 
 # Load environment variables
 load_dotenv()
 
+# This module's logger, including PureLoggingMiddleware request logs, follows
+# LOG_LEVEL. Only this logger is configured: setting the root level would also
+# turn on INFO logging in azure-core, azure-identity and httpx.
+# Records go through a queue so a log call on the request path only enqueues;
+# a QueueListener thread does the blocking write to stderr.
+logger = logging.getLogger(__name__)
+logger.setLevel(get_config().log_level)
+if not logger.handlers:
+    _log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    _log_listener = QueueListener(_log_queue, _log_handler)
+    _log_listener.start()
+    # Flush queued records when the process exits
+    atexit.register(_log_listener.stop)
+    logger.addHandler(QueueHandler(_log_queue))
+    logger.propagate = False
 
-async def create_agent_with_mcp() -> Agent:
+
+async def create_agent_with_mcp(
+    provider: AzureAIProjectAgentProvider,
+    mcp_tools: list[HostedMCPTool],
+) -> Agent:
     """
     Create an agent with MCP tool connection to knowledge base.
     
+    Args:
+        provider: Open Azure AI Project provider; it must stay open for as
+            long as the returned agent is in use
+        mcp_tools: MCP tools giving the agent access to the knowledge base
+    
     Returns:
         Agent: Configured agent instance with MCP tools
     """
-    # Define MCP tool for knowledge base access
-    # This connects to the Azure AI Search knowledge base via MCP
-    mcp_kb_tool = HostedMCPTool(
-        name="kb_kb_archive_f1nat",
-        description="Access to knowledge base containing project information for intake form assistance",
-        url=os.getenv(
-            "MCP_SERVER_URL",
-            "https://aisearch-nv-eastus2-dev-01.search.windows.net/knowledgebases/kb-archive/mcp?api-version=2025-11-01-Preview"
-        ),
-        approval_mode="never",  # Corresponds to require_approval: never in YAML
-        # project_connection_id would be handled by the Azure AI Project context
-    )
-    
     # Create agent using Azure AI Project provider
     # AZURE FOUNDRY DEPLOYMENT: This is where the agent is deployed to Foundry!
     # - AzureAIProjectAgentProvider connects to Azure AI Project (Foundry)
     # - Uses AZURE_AI_PROJECT_CONNECTION_STRING for authentication
     # - The agent is provisioned within Foundry infrastructure
     # - Benefits: managed models, enterprise security, scalability, monitoring
-    async with AzureAIProjectAgentProvider() as provider:
-        agent = await provider.create_agent(
-            name="IntakeFormAssistant",
-            model=os.getenv("AGENT_MODEL", "gpt-5-mini"),
-            instructions="""## Role
+    return await provider.create_agent(
+        name="IntakeFormAssistant",
+        model=get_config().model,
+        instructions="""## Role
 You are assisting users complete an intake form and have access to a knowledge
 base that contains project information.""",
-            description="Agent that assists with intake forms using knowledge base access via MCP",
-            tools=[mcp_kb_tool],  # Attach MCP tool for knowledge base
-        )
-        return agent
+        description="Agent that assists with intake forms using knowledge base access via MCP",
+        tools=mcp_tools,  # Attach MCP tools for knowledge base
+    )
 
 
-def create_fastapi_app(agent: Agent) -> FastAPI:
+class PureLoggingMiddleware:
+    """
+    Request logging middleware implemented as plain ASGI.
+    
+    Add auth/logging hooks to this app as pure ASGI middleware like this one
+    rather than with @app.middleware("http"). BaseHTTPMiddleware runs every
+    request in an extra task and wraps the response body, which adds latency
+    and can get in the way of the AG-UI server-sent event stream; this class
+    only observes the messages passing through. Its log records are queued
+    and written by a background listener, so no request waits on stderr.
     """
-    Create FastAPI application with AG-UI endpoint.
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            logger.info(
+                "%s %s %d %.1fms",
+                scope["method"],
+                scope["path"],
+                status_code,
+                (time.perf_counter() - start) * 1000,
+            )
+
+
+async def healthz(request: Request) -> PlainTextResponse:
+    """
+    Liveness probe that answers without touching the agent.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        PlainTextResponse: Plain "ok" response
+    """
+    return PlainTextResponse("ok")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Create the agent on startup and keep its provider open until shutdown.
+    
+    The provider and agent are stored on app.state so they are created once
+    per process and the agent never outlives the provider resources it uses.
+    The AG-UI endpoint exists only while the lifespan is running, so the
+    route table and /openapi.json include it once startup has finished.
     
     Args:
-        agent: Configured agent instance
+        app: FastAPI application being started
+    """
+    # Numba is optional; when it is installed, compile the numeric helpers in
+    # a thread before the first request needs them. Without it neither numpy
+    # nor the helpers are imported here.
+    if importlib.util.find_spec("numba") is not None:
+        import agent_numerics
+        await asyncio.to_thread(agent_numerics.warm_up)
+    
+    print("Creating agent with MCP knowledge base connection...")
+    async with AsyncExitStack() as stack:
+        # One credential for the process. The chain is probed on the first
+        # token request; the VS Code source is excluded because a server never
+        # runs inside an editor session (the async chain has no interactive
+        # browser source to exclude)
+        credential = await stack.enter_async_context(
+            DefaultAzureCredential(exclude_visual_studio_code_credential=True)
+        )
+        provider = await stack.enter_async_context(
+            AzureAIProjectAgentProvider(credential=credential)
+        )
+        
+        # Define MCP tool for knowledge base access
+        # This connects to the Azure AI Search knowledge base via MCP
+        mcp_kb_tool = HostedMCPTool(**get_mcp_tool_config())
+        
+        mcp_tools = [mcp_kb_tool]
+        
+        # Optional batch aggregator so several knowledge base operations in one
+        # turn go over the wire as a single batch_execute call
+        batch_config = get_mcp_batch_tool_config()
+        if batch_config:
+            mcp_tools.append(HostedMCPTool(**batch_config))
         
+        agent = await create_agent_with_mcp(provider, mcp_tools)
+        app.state.provider = provider
+        app.state.agent = agent
+        print(f"Agent created: {agent.name}")
+        
+        # Add AG-UI endpoint at root path
+        # AG-UI SUPPORT: This function from agent-framework-ag-ui package exposes
+        # the AG-UI protocol endpoints, enabling frontend integration with:
+        # - CopilotKit and other AG-UI clients
+        # - Streaming responses via server-sent events
+        # - Tool execution transparency
+        # - Rich UI components support
+        # This IS the AG-UI integration - add_agent_framework_fastapi_endpoint()
+        # is the official way to expose AG-UI endpoints in the Microsoft Agent Framework
+        # The endpoint needs the agent, so it is registered here and removed
+        # again on shutdown: starting the same app twice must not leave a
+        # route bound to an earlier, already closed provider
+        routes_before = list(app.router.routes)
+        add_agent_framework_fastapi_endpoint(app, agent, "/")
+        agui_routes = [route for route in app.router.routes if route not in routes_before]
+        app.openapi_schema = None
+        print("\nAgent is ready to assist with intake forms using knowledge base!")
+        
+        try:
+            yield
+        finally:
+            for route in agui_routes:
+                app.router.routes.remove(route)
+            app.openapi_schema = None
+
+
+def create_fastapi_app() -> FastAPI:
+    """
+    Create FastAPI application with AG-UI endpoint.
+    
+    The agent itself is created by the application lifespan, which registers
+    the AG-UI endpoint once the agent is available.
+    
     Returns:
         FastAPI: Application with AG-UI endpoint configured
     """
     app = FastAPI(
         title="Intake Form Assistant Agent",
         description="AG-UI enabled agent with MCP knowledge base access",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan,
     )
     
-    # Add AG-UI endpoint at root path
-    # AG-UI SUPPORT: This function from agent-framework-ag-ui package exposes
-    # the AG-UI protocol endpoints, enabling frontend integration with:
-    # - CopilotKit and other AG-UI clients
-    # - Streaming responses via server-sent events
-    # - Tool execution transparency
-    # - Rich UI components support
-    # This IS the AG-UI integration - add_agent_framework_fastapi_endpoint()
-    # is the official way to expose AG-UI endpoints in the Microsoft Agent Framework
-    add_agent_framework_fastapi_endpoint(app, agent, "/")
+    # Compress larger non-streaming responses; level 5 gives close to the best
+    # ratio at a fraction of the CPU cost of level 9. The AG-UI stream is
+    # text/event-stream, which GZipMiddleware skips on purpose (Starlette >= 0.46)
+    # so events are never held back in the gzip buffer.
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+    
+    # Request logging; see PureLoggingMiddleware for why middleware here is
+    # written as plain ASGI
+    app.add_middleware(PureLoggingMiddleware)
+    
+    # Health check as a plain Starlette route, registered before the AG-UI
+    # endpoint so probes never go through the agent handler
+    app.add_route("/healthz", healthz, methods=["GET"])
     
     return app
 
 
-async def main():
+# Module-level application so uvicorn workers (and "uvicorn agent:app") can
+# import it. Each worker runs its own lifespan, so the provider and agent are
+# created per worker process and never shared between them.
+app = create_fastapi_app()
+
+
+def run_uvicorn(config: Config) -> None:
     """
-    Main entry point for creating and running the agent server.
+    Serve the app with uvicorn over HTTP/1.1.
+    
+    Args:
+        config: Agent server configuration
     """
-    print("Creating agent with MCP knowledge base connection...")
-    agent = await create_agent_with_mcp()
-    print(f"Agent created: {agent.name}")
+    # The app is passed as an import string so uvicorn can start several worker
+    # processes; each one imports this module and serves the same socket.
+    uvicorn.run(
+        "agent:app",
+        host=config.host,
+        port=config.port,
+        workers=config.workers,
+        loop="uvloop" if uvloop else "asyncio",
+        http="httptools",
+        # Uvicorn's access log writes to stderr on the request path. Request
+        # lines come from PureLoggingMiddleware instead, which only enqueues
+        # them for the background log listener (at LOG_LEVEL INFO or lower)
+        access_log=False,
+        log_level="warning",
+        ssl_certfile=config.tls_certfile,
+        ssl_keyfile=config.tls_keyfile,
+    )
+
+
+def run_hypercorn(config: Config) -> None:
+    """
+    Serve the app with Hypercorn, negotiating HTTP/2 where the client supports it.
+    
+    Over HTTP/2 several AG-UI event streams from one client share a single
+    connection instead of holding one TCP socket each. Browsers only use
+    HTTP/2 over TLS, so set TLS_CERTFILE and TLS_KEYFILE for production.
     
-    print("Setting up FastAPI app with AG-UI endpoint...")
-    app = create_fastapi_app(agent)
-    print("FastAPI app configured")
+    Args:
+        config: Agent server configuration
+    """
+    from hypercorn.config import Config as HypercornConfig
+    from hypercorn.run import run
+    
+    hypercorn_config = HypercornConfig()
+    hypercorn_config.application_path = "agent:app"
+    hypercorn_config.bind = [f"{config.host}:{config.port}"]
+    hypercorn_config.alpn_protocols = ["h2", "http/1.1"]
+    hypercorn_config.workers = config.workers
+    hypercorn_config.worker_class = "uvloop" if uvloop else "asyncio"
+    hypercorn_config.loglevel = "WARNING"
+    # Request lines come from PureLoggingMiddleware's queued logging, as with uvicorn
+    hypercorn_config.accesslog = None
+    hypercorn_config.certfile = config.tls_certfile
+    hypercorn_config.keyfile = config.tls_keyfile
+    run(hypercorn_config)
+
+
+def main() -> None:
+    """
+    Main entry point for running the agent server.
     
-    # Configuration for uvicorn server
-    host = os.getenv("HOST", "0.0.0.0")
-    port = int(os.getenv("PORT", "8000"))
+    Uses uvicorn by default; set SERVER=hypercorn to serve over HTTP/2.
+    """
+    # Configuration for the server
+    config = get_config()
+    scheme = "https" if config.tls_certfile else "http"
     
-    print(f"\nStarting AG-UI endpoint server on {host}:{port}")
-    print(f"AG-UI endpoint available at: http://{host}:{port}/")
-    print("\nAgent is ready to assist with intake forms using knowledge base!")
+    print(
+        f"\nStarting AG-UI endpoint server ({config.server}) on "
+        f"{config.host}:{config.port} with {config.workers} worker(s)"
+    )
+    print(f"AG-UI endpoint available at: {scheme}://{config.host}:{config.port}/")
     
-    # Import and run uvicorn
-    import uvicorn
-    uvicorn.run(app, host=host, port=port)
+    if config.server == "hypercorn":
+        run_hypercorn(config)
+    else:
+        run_uvicorn(config)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
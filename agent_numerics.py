@@ -0,0 +1,59 @@
+"""
+Numeric post-processing helpers for the agent pipeline.
+
+Put numeric helpers for the agent (score reranking, embedding similarity,
+token statistics) in this module, written as explicit loops over NumPy
+arrays and decorated with @njit. When Numba is installed they are compiled
+to machine code (and the compilation is cached on disk); without Numba the
+same functions run as plain Python.
+
+NumPy and Numba are optional dependencies (pip install numpy numba). Import
+this module only where a helper is used, so the agent server starts without
+them.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):  # type: ignore
+        """
+        Fallback for numba.njit that returns the function unchanged.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def rerank(scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Combine per-signal relevance scores into one weighted score per result.
+    
+    Args:
+        scores: Array of shape (n_results, n_signals) with one score per
+            result and ranking signal
+        weights: Array of shape (n_signals,) with the weight of each signal
+        
+    Returns:
+        np.ndarray: Array of shape (n_results,) with the combined scores
+    """
+    n_results, n_signals = scores.shape
+    combined = np.zeros(n_results)
+    for i in range(n_results):
+        total = 0.0
+        for j in range(n_signals):
+            total += scores[i, j] * weights[j]
+        combined[i] = total
+    return combined
+
+
+def warm_up() -> None:
+    """
+    Call each compiled helper once on tiny inputs.
+    
+    Numba compiles on first call, so running this at startup keeps the JIT
+    latency off the first real request.
+    """
+    rerank(np.zeros((1, 1)), np.ones(1))
@@ -0,0 +1,28 @@
+"""
+Development-only mypyc build of config.py.
+
+Compiles config.py (plain, fully typed Python with no framework
+dependencies) to a C extension next to the source file; Python then imports
+the extension in place of config.py. agent.py is not compiled because mypyc
+cannot compile its async generator lifespan.
+
+This is an optional local experiment, not part of the shipped image: the
+Dockerfile and CI run the plain sources, and there is no installable
+distribution. Delete the generated config.*.so (and build/) to go back to the
+source module.
+
+Usage (requires mypy and a C compiler):
+    pip install mypy
+    python build_mypyc.py
+"""
+
+from setuptools import setup
+from mypyc.build import mypycify
+
+
+if __name__ == "__main__":
+    setup(
+        name="ag-ui-agent-mcp-config",
+        ext_modules=mypycify(["config.py"]),
+        script_args=["build_ext", "--inplace"],
+    )
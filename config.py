@@ -0,0 +1,212 @@
+"""
+Configuration for the agent server, resolved once from environment variables.
+
+This module holds plain, fully typed code with no framework dependencies so
+it can be compiled with mypyc (see build_mypyc.py); agent.py keeps the
+FastAPI and agent framework glue. Environment variables from .env must be
+loaded before get_config() is first called.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+DEFAULT_MCP_SERVER_URL = (
+    "https://aisearch-nv-eastus2-dev-01.search.windows.net/knowledgebases/kb-archive/mcp"
+    "?api-version=2025-11-01-Preview"
+)
+
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Agent server configuration resolved from environment variables.
+    """
+    mcp_url: str
+    mcp_batch_url: Optional[str]
+    mcp_batch_max_concurrent: int
+    mcp_batch_stop_on_error: bool
+    model: str
+    host: str
+    port: int
+    workers: int
+    server: str
+    tls_certfile: Optional[str]
+    tls_keyfile: Optional[str]
+    log_level: str
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    """
+    Read a positive integer environment variable.
+    
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is not set
+        minimum: Smallest accepted value
+        
+    Returns:
+        int: Parsed value
+        
+    Raises:
+        ValueError: If the value is not an integer or is below minimum
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+    if parsed < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {parsed}")
+    return parsed
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """
+    Read a boolean environment variable (true/false, yes/no, on/off, 1/0).
+    
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is not set
+        
+    Returns:
+        bool: Parsed value
+        
+    Raises:
+        ValueError: If the value is not a recognised boolean
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    normalized = value.strip().lower()
+    if normalized in ("1", "true", "yes", "on"):
+        return True
+    if normalized in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"{name} must be true or false, got {value!r}")
+
+
+def _env_choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    """
+    Read an environment variable that must be one of a fixed set of values.
+    
+    The comparison ignores case and surrounding whitespace.
+    
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is not set
+        choices: Accepted values, spelled as they should be returned
+        
+    Returns:
+        str: Matching entry from choices
+        
+    Raises:
+        ValueError: If the value is not one of choices
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    normalized = value.strip().lower()
+    for choice in choices:
+        if normalized == choice.lower():
+            return choice
+    raise ValueError(f"{name} must be one of {', '.join(choices)}, got {value!r}")
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Resolve the agent server configuration from the environment.
+    
+    The result is cached so environment parsing only happens once per process.
+    
+    Returns:
+        Config: Agent server configuration
+        
+    Raises:
+        ValueError: If a numeric, boolean or enumerated setting is malformed
+    """
+    # The batch settings only matter when the aggregator is enabled, so a stale
+    # value for a disabled feature is ignored instead of stopping the server
+    mcp_batch_url = os.getenv("MCP_BATCH_SERVER_URL") or None
+    return Config(
+        mcp_url=os.getenv("MCP_SERVER_URL", DEFAULT_MCP_SERVER_URL),
+        mcp_batch_url=mcp_batch_url,
+        mcp_batch_max_concurrent=(
+            _env_int("MCP_BATCH_MAX_CONCURRENT", 5) if mcp_batch_url else 5
+        ),
+        mcp_batch_stop_on_error=(
+            _env_bool("MCP_BATCH_STOP_ON_ERROR", False) if mcp_batch_url else False
+        ),
+        model=os.getenv("AGENT_MODEL", "gpt-5-mini"),
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=_env_int("PORT", 8000),
+        # One worker unless WORKERS asks for more: every worker provisions its
+        # own Foundry agent on startup, and os.cpu_count() reports the host's
+        # CPUs rather than a container's CPU quota
+        workers=_env_int("WORKERS", 1),
+        server=_env_choice("SERVER", "uvicorn", ("uvicorn", "hypercorn")),
+        tls_certfile=os.getenv("TLS_CERTFILE"),
+        tls_keyfile=os.getenv("TLS_KEYFILE"),
+        log_level=_env_choice(
+            "LOG_LEVEL", "INFO", ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_mcp_tool_config() -> dict[str, Any]:
+    """
+    Resolve the MCP knowledge base tool configuration.
+    
+    The result is cached so the tool arguments are only built once per process.
+    
+    Returns:
+        dict: Keyword arguments for HostedMCPTool
+    """
+    return {
+        "name": "kb_kb_archive_f1nat",
+        "description": "Access to knowledge base containing project information for intake form assistance",
+        "url": get_config().mcp_url,
+        "approval_mode": "never",  # Corresponds to require_approval: never in YAML
+        # project_connection_id would be handled by the Azure AI Project context
+    }
+
+
+@lru_cache(maxsize=1)
+def get_mcp_batch_tool_config() -> Optional[dict[str, Any]]:
+    """
+    Resolve the optional MCP batch aggregator tool configuration.
+    
+    When MCP_BATCH_SERVER_URL points at a BatchIt-style aggregator, the agent
+    can send several knowledge base operations from one turn as a single
+    batch_execute call instead of one round trip per operation.
+    
+    maxConcurrent and stopOnError are arguments of each batch_execute call,
+    which the model writes, so MCP_BATCH_MAX_CONCURRENT and
+    MCP_BATCH_STOP_ON_ERROR are only passed to it as hints in the tool
+    description; this server does not enforce them.
+    
+    Returns:
+        Optional[dict]: Keyword arguments for HostedMCPTool, or None when no
+            aggregator is configured
+    """
+    config = get_config()
+    if not config.mcp_batch_url:
+        return None
+    
+    return {
+        "name": "kb_batch",
+        "description": (
+            "Batch aggregator for the knowledge base MCP tools. When a turn needs "
+            "several knowledge base operations, send them together in one "
+            f"batch_execute call with maxConcurrent={config.mcp_batch_max_concurrent} "
+            f"and stopOnError={str(config.mcp_batch_stop_on_error).lower()}; results "
+            "are returned per operation in the order they were sent."
+        ),
+        "url": config.mcp_batch_url,
+        "approval_mode": "never",
+    }
@@ -2,17 +2,21 @@
 Example client script for testing the AG-UI agent endpoint.
 
 This script demonstrates how to interact with the deployed agent
-using simple HTTP requests.
+using a single pooled async HTTP client.
 """
 
-import json
-import requests
+import asyncio
+import time
+import httpx
 
 
-def test_agent_endpoint(base_url: str = "http://localhost:8000"):
+async def test_agent_endpoint(base_url: str = "http://localhost:8000"):
     """
     Test the AG-UI agent endpoint with a sample query.
     
+    All requests share one client so the connection is kept alive (and
+    multiplexed over HTTP/2 where the server supports it).
+    
     Args:
         base_url: Base URL of the agent server
     """
@@ -21,16 +25,68 @@ def test_agent_endpoint(base_url: str = "http://localhost:8000"):
     print("=" * 70)
     print(f"\nBase URL: {base_url}")
     
+    async with httpx.AsyncClient(base_url=base_url, http2=True, timeout=30) as client:
+        await _run_tests(client)
+    
+    print("\n" + "=" * 70)
+    print("Testing Complete")
+    print("=" * 70)
+
+
+async def _stream_chat(client: httpx.AsyncClient, payload: dict, max_chars: int):
+    """
+    Send a chat request and print the AG-UI server-sent events as they arrive.
+    
+    Args:
+        client: HTTP client bound to the agent server base URL
+        payload: Chat request body
+        max_chars: Maximum number of characters to print per event
+        
+    Returns:
+        int: HTTP status code of the response
+    """
+    start = time.perf_counter()
+    first_event_at = None
+    async with client.stream(
+        "POST",
+        "/chat",
+        json=payload,
+        headers={"Accept": "text/event-stream"}
+    ) as response:
+        print(f"   Status: {response.status_code}")
+        if response.status_code != 200:
+            body = await response.aread()
+            print(f"   Response: {body.decode(errors='replace')[:200]}")
+            return response.status_code
+        
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            if first_event_at is None:
+                first_event_at = time.perf_counter()
+                print(f"   Time to first event: {(first_event_at - start) * 1000:.0f} ms")
+            print(f"   {line[5:].strip()[:max_chars]}")
+    
+    return response.status_code
+
+
+async def _run_tests(client: httpx.AsyncClient):
+    """
+    Run the endpoint tests using a shared client.
+    
+    Args:
+        client: HTTP client bound to the agent server base URL
+    """
     # Test 1: Basic connectivity
     print("\n1. Testing basic connectivity...")
     try:
-        response = requests.get(f"{base_url}/")
+        response = await client.get("/healthz")
         print(f"   Status: {response.status_code}")
         if response.status_code == 200:
             print("   ✓ Endpoint is reachable")
         else:
             print(f"   ⚠ Unexpected status code: {response.status_code}")
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"   ✗ Connection failed: {e}")
         return
     
@@ -46,24 +102,11 @@ def test_agent_endpoint(base_url: str = "http://localhost:8000"):
     }
     
     try:
-        response = requests.post(
-            f"{base_url}/chat",
-            json=test_message,
-            headers={"Content-Type": "application/json"}
-        )
-        print(f"   Status: {response.status_code}")
-        
-        if response.status_code == 200:
+        status = await _stream_chat(client, test_message, max_chars=100)
+        if status == 200:
             print("   ✓ Agent responded successfully")
-            data = response.json()
-            if "response" in data:
-                print(f"\n   Agent response: {data['response'][:100]}...")
-        else:
-            print(f"   Response: {response.text[:200]}")
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"   ✗ Request failed: {e}")
-    except json.JSONDecodeError as e:
-        print(f"   ✗ Failed to parse response: {e}")
     
     # Test 3: Query with knowledge base requirement
     print("\n3. Testing knowledge base query...")
@@ -77,24 +120,11 @@ def test_agent_endpoint(base_url: str = "http://localhost:8000"):
     }
     
     try:
-        response = requests.post(
-            f"{base_url}/chat",
-            json=kb_query,
-            headers={"Content-Type": "application/json"}
-        )
-        print(f"   Status: {response.status_code}")
-        
-        if response.status_code == 200:
+        status = await _stream_chat(client, kb_query, max_chars=200)
+        if status == 200:
             print("   ✓ Knowledge base query successful")
-            data = response.json()
-            if "response" in data:
-                print(f"\n   Agent response: {data['response'][:200]}...")
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"   ✗ Request failed: {e}")
-    
-    print("\n" + "=" * 70)
-    print("Testing Complete")
-    print("=" * 70)
 
 
 if __name__ == "__main__":
@@ -102,4 +132,4 @@ if __name__ == "__main__":
     
     # Allow custom base URL as command line argument
     base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000"
-    test_agent_endpoint(base_url)
+    asyncio.run(test_agent_endpoint(base_url))